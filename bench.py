@@ -0,0 +1,75 @@
+import argparse
+import time
+
+import numpy as np
+
+from scr.array_avl_tree import ArrayAVLTree
+from scr.avl_tree import AVLTree
+
+# The Numba and C implementations are optional, they are benchmarked only when available
+try:
+    from scr.numba_avl_tree import NumbaAVLTree
+except ImportError:
+    NumbaAVLTree = None
+
+try:
+    from scr._avltree import AVLTree as CAVLTree
+except ImportError:
+    CAVLTree = None
+
+
+def positive_int(value: str) -> int:
+    # Every measurement is divided by the number of keys, so there must be at least one
+    size = int(value)
+    if size < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {size}")
+    return size
+
+
+def time_per_op(operation, keys: list[int]) -> float:
+    start = time.perf_counter_ns()
+    for key in keys:
+        operation(key)
+    return (time.perf_counter_ns() - start) / len(keys)
+
+
+def bench(tree_class, keys: list[int]) -> tuple[float, float, float]:
+    tree = tree_class()
+    insert_ns = time_per_op(tree.insert, keys)
+    find_ns = time_per_op(tree.find, keys)
+    remove_ns = time_per_op(tree.remove, keys)
+    return insert_ns, find_ns, remove_ns
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure ns/op of insert, find and remove of the AVL trees")
+    parser.add_argument("-n", "--size", type=positive_int, default=2**16, help="number of keys")
+    parser.add_argument("--seed", type=int, default=None, help="seed of the random keys")
+    args = parser.parse_args()
+
+    # All keys are generated at once, so neither the RNG nor anything else is measured along with the tree.
+    # They are converted to Python ints beforehand too.
+    rng = np.random.default_rng(args.seed)
+    random_keys = rng.integers(0, 2**31, size=args.size, dtype=np.int64)
+    orders = {
+        "random": random_keys.tolist(),
+        "sorted": np.sort(random_keys).tolist(),
+    }
+
+    trees = {"AVLTree": AVLTree, "ArrayAVLTree": ArrayAVLTree}
+    if NumbaAVLTree is not None:
+        NumbaAVLTree.warm_up()
+        trees["NumbaAVLTree"] = NumbaAVLTree
+    if CAVLTree is not None:
+        trees["_avltree.AVLTree"] = CAVLTree
+
+    print(f"{args.size} keys, ns/op")
+    print(f"{'tree':<18}{'order':<8}{'insert':>10}{'find':>10}{'remove':>10}")
+    for name, tree_class in trees.items():
+        for order, keys in orders.items():
+            insert_ns, find_ns, remove_ns = bench(tree_class, keys)
+            print(f"{name:<18}{order:<8}{insert_ns:>10.0f}{find_ns:>10.0f}{remove_ns:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+from collections import deque
 from random import randint
 
 from scr.avl_tree import AVLTree, Node
@@ -8,23 +9,28 @@ def print_tree(root: Node | None):
         print("[empty tree]")
         return
 
-    # Calculate tree height to determine display width
-    def get_height(node):
-        if not node:
-            return 0
-        return 1 + max(get_height(node.left), get_height(node.right))
+    # Calculate tree height to determine display width.
+    # Count levels of an iterative level-order walk, so deep trees don't hit the recursion limit.
+    # It relies only on `left`/`right` attributes, so it works with node views of the C tree too.
+    def get_height(root):
+        height = 0
+        level = [root]
+        while level:
+            height += 1
+            level = [child for node in level for child in (node.left, node.right) if child]
+        return height
 
     height = get_height(root)
     max_width = 2**height
 
     # Level-order traversal with position
-    queue = [(root, 0, max_width // 2)]
+    queue = deque([(root, 0, max_width // 2)])
     prev_level = 0
     line = ""
 
     positions = {}
     while queue:
-        node, level, pos = queue.pop(0)
+        node, level, pos = queue.popleft()
         if level != prev_level:
             print(line)
             line = ""
@@ -0,0 +1,547 @@
+// C implementation of the AVL tree from `avl_tree.py`.
+// All nodes live in one contiguous arena and refer to each other by index, so growing the arena
+// with `realloc` never invalidates the links. Slots of removed nodes are reused through a free list.
+// Like in `avl_tree.py`, nodes have no parent link.
+// Keys are 64-bit ints, and `find`/`root` return read-only views of the nodes instead of the nodes themselves.
+// The algorithms are the same as in `avl_tree.py`: nodes store the balance factor
+// (right subtree height - left subtree height) and rotations update it in place.
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <stdint.h>
+#include <stdlib.h>
+
+#define NIL (-1)
+#define DEFAULT_CAPACITY 16
+// The same bound on the root-to-node path length as `MAX_HEIGHT` in `numba_avl_tree.py`
+#define MAX_HEIGHT 64
+
+typedef struct {
+    long long value;
+    int32_t left;
+    int32_t right;
+    int8_t balance;
+} node_t;
+
+typedef struct {
+    PyObject_HEAD
+    node_t *nodes;
+    int32_t capacity;
+    // Number of arena slots handed out so far
+    int32_t used;
+    // Head of the free slots list, the slots are linked through their `right` field
+    int32_t free_head;
+    int32_t root;
+    Py_ssize_t size;
+} AVLTreeObject;
+
+// Python view of a node: it refers to the tree and to the slot of the node in the arena.
+// A view is only meaningful while its node is in the tree, after removal the slot may be reused.
+typedef struct {
+    PyObject_HEAD
+    AVLTreeObject *tree;
+    int32_t index;
+} NodeObject;
+
+static PyTypeObject AVLTreeType;
+static PyTypeObject NodeType;
+
+/* Tree operations */
+
+static int32_t
+search(const AVLTreeObject *self, long long key)
+{
+    const node_t *nodes = self->nodes;
+    int32_t current = self->root;
+
+    while (current != NIL) {
+        long long value = nodes[current].value;
+        if (key == value) {
+            break;
+        }
+        current = key < value ? nodes[current].left : nodes[current].right;
+    }
+
+    return current;
+}
+
+static void
+replace_child(AVLTreeObject *self, int32_t parent, int32_t old_child, int32_t new_child)
+{
+    node_t *nodes = self->nodes;
+
+    if (parent == NIL) {
+        self->root = new_child;
+    }
+    else if (nodes[parent].left == old_child) {
+        nodes[parent].left = new_child;
+    }
+    else {
+        nodes[parent].right = new_child;
+    }
+}
+
+// The rotations expect that the node has the child they rotate, the callers guarantee it.
+// They return the new root of the subtree, the caller links it to the parent.
+static int32_t
+rotate_right(node_t *nodes, int32_t node)
+{
+    int32_t left_child = nodes[node].left;
+
+    // Perform rotation
+    nodes[node].left = nodes[left_child].right;
+    nodes[left_child].right = node;
+
+    // Update balance factors of the two rotated nodes
+    int node_balance = nodes[node].balance;
+    int child_balance = nodes[left_child].balance;
+    node_balance = node_balance + 1 - (child_balance < 0 ? child_balance : 0);
+    child_balance = child_balance + 1 + (node_balance > 0 ? node_balance : 0);
+    nodes[node].balance = (int8_t)node_balance;
+    nodes[left_child].balance = (int8_t)child_balance;
+    return left_child;
+}
+
+static int32_t
+rotate_left(node_t *nodes, int32_t node)
+{
+    int32_t right_child = nodes[node].right;
+
+    // Perform rotation
+    nodes[node].right = nodes[right_child].left;
+    nodes[right_child].left = node;
+
+    // Update balance factors of the two rotated nodes
+    int node_balance = nodes[node].balance;
+    int child_balance = nodes[right_child].balance;
+    node_balance = node_balance - 1 - (child_balance > 0 ? child_balance : 0);
+    child_balance = child_balance - 1 + (node_balance < 0 ? node_balance : 0);
+    nodes[node].balance = (int8_t)node_balance;
+    nodes[right_child].balance = (int8_t)child_balance;
+    return right_child;
+}
+
+static int32_t
+rebalance(node_t *nodes, int32_t node)
+{
+    // Fixes the node with balance factor -2 or 2 and returns the new root of its subtree
+    if (nodes[node].balance < 0) {
+        if (nodes[nodes[node].left].balance > 0) {
+            nodes[node].left = rotate_left(nodes, nodes[node].left);
+        }
+        return rotate_right(nodes, node);
+    }
+
+    if (nodes[nodes[node].right].balance < 0) {
+        nodes[node].right = rotate_right(nodes, nodes[node].right);
+    }
+    return rotate_left(nodes, node);
+}
+
+static int32_t
+allocate_node(AVLTreeObject *self)
+{
+    // Returns a free slot, or NIL with an exception set if the arena can't grow
+    if (self->free_head != NIL) {
+        int32_t node = self->free_head;
+        self->free_head = self->nodes[node].right;
+        return node;
+    }
+
+    if (self->used == self->capacity) {
+        if (self->capacity > INT32_MAX / 2) {
+            PyErr_SetString(PyExc_OverflowError, "the tree can't hold more nodes");
+            return NIL;
+        }
+        int32_t capacity = self->capacity == 0 ? DEFAULT_CAPACITY : self->capacity * 2;
+        node_t *nodes = PyMem_Realloc(self->nodes, (size_t)capacity * sizeof(node_t));
+        if (nodes == NULL) {
+            PyErr_NoMemory();
+            return NIL;
+        }
+        self->nodes = nodes;
+        self->capacity = capacity;
+    }
+
+    return self->used++;
+}
+
+static void
+free_node(AVLTreeObject *self, int32_t node)
+{
+    self->nodes[node].right = self->free_head;
+    self->free_head = node;
+}
+
+static int
+tree_insert(AVLTreeObject *self, long long key)
+{
+    // Returns 1 if the key was inserted, 0 if it's already in the tree, -1 on error.
+    // Single descent from the root. On the way down it remembers the deepest node with non-zero balance
+    // (and its parent), because only the subtree of this node can get out of balance after insertion.
+    node_t *nodes = self->nodes;
+    int32_t parent = NIL;
+    int32_t current = self->root;
+    int32_t top = current;
+    int32_t top_parent = NIL;
+
+    while (current != NIL) {
+        long long value = nodes[current].value;
+        if (key == value) {
+            return 0;
+        }
+        if (nodes[current].balance != 0) {
+            top = current;
+            top_parent = parent;
+        }
+        parent = current;
+        current = key < value ? nodes[current].left : nodes[current].right;
+    }
+
+    // The node is allocated only when it's known that the key isn't in the tree yet
+    int32_t node = allocate_node(self);
+    if (node == NIL) {
+        return -1;
+    }
+
+    // The arena may be moved while growing
+    nodes = self->nodes;
+    nodes[node].value = key;
+    nodes[node].left = NIL;
+    nodes[node].right = NIL;
+    nodes[node].balance = 0;
+    self->size++;
+
+    if (parent == NIL) {
+        self->root = node;
+        return 1;
+    }
+
+    if (key < nodes[parent].value) {
+        nodes[parent].left = node;
+    }
+    else {
+        nodes[parent].right = node;
+    }
+
+    // Update balances on the path from the top node down to the new one
+    current = top;
+    while (current != node) {
+        if (key < nodes[current].value) {
+            nodes[current].balance--;
+            current = nodes[current].left;
+        }
+        else {
+            nodes[current].balance++;
+            current = nodes[current].right;
+        }
+    }
+
+    if (nodes[top].balance == -2 || nodes[top].balance == 2) {
+        // After insertion a rotation restores the subtree height it had before, so nothing above changes
+        replace_child(self, top_parent, top, rebalance(nodes, top));
+    }
+
+    return 1;
+}
+
+static int
+tree_remove(AVLTreeObject *self, long long key)
+{
+    // Returns 1 if the key was removed, 0 if it isn't in the tree
+    node_t *nodes = self->nodes;
+    // The path from the root to the removed node and whether it goes to the left child on each step
+    int32_t path[MAX_HEIGHT];
+    char path_is_left[MAX_HEIGHT];
+    int depth = 0;
+    int32_t node = self->root;
+
+    while (node != NIL) {
+        long long value = nodes[node].value;
+        if (key == value) {
+            break;
+        }
+        int is_left = key < value;
+        path[depth] = node;
+        path_is_left[depth] = (char)is_left;
+        depth++;
+        node = is_left ? nodes[node].left : nodes[node].right;
+    }
+
+    if (node == NIL) {
+        return 0;
+    }
+
+    if (nodes[node].left != NIL && nodes[node].right != NIL) {
+        // The successor's value is moved into the node and the successor is removed instead
+        path[depth] = node;
+        path_is_left[depth] = 0;
+        depth++;
+        int32_t successor = nodes[node].right;
+        while (nodes[successor].left != NIL) {
+            path[depth] = successor;
+            path_is_left[depth] = 1;
+            depth++;
+            successor = nodes[successor].left;
+        }
+        nodes[node].value = nodes[successor].value;
+        node = successor;
+    }
+
+    // Now the node has at most one child which takes its place
+    int32_t child = nodes[node].right == NIL ? nodes[node].left : nodes[node].right;
+    replace_child(self, depth > 0 ? path[depth - 1] : NIL, node, child);
+    free_node(self, node);
+    self->size--;
+
+    // The subtree under the last node of the path became one level lower
+    while (depth > 0) {
+        depth--;
+        int32_t current = path[depth];
+        nodes[current].balance += path_is_left[depth] ? 1 : -1;
+        int balance = nodes[current].balance;
+
+        if (balance == -1 || balance == 1) {
+            // The node was balanced before, so its height didn't change
+            break;
+        }
+        if (balance != 0) {
+            int32_t subtree = rebalance(nodes, current);
+            replace_child(self, depth > 0 ? path[depth - 1] : NIL, current, subtree);
+            if (nodes[subtree].balance != 0) {
+                // The sibling subtree was balanced, the rotation kept the subtree height
+                break;
+            }
+        }
+    }
+
+    return 1;
+}
+
+/* Node type */
+
+static PyObject *
+node_new_view(AVLTreeObject *tree, int32_t index)
+{
+    if (index == NIL) {
+        Py_RETURN_NONE;
+    }
+
+    NodeObject *view = PyObject_New(NodeObject, &NodeType);
+    if (view == NULL) {
+        return NULL;
+    }
+    view->tree = (AVLTreeObject *)Py_NewRef(tree);
+    view->index = index;
+    return (PyObject *)view;
+}
+
+static void
+Node_dealloc(NodeObject *self)
+{
+    Py_DECREF(self->tree);
+    PyObject_Free(self);
+}
+
+static PyObject *
+Node_repr(NodeObject *self)
+{
+    const node_t *node = &self->tree->nodes[self->index];
+    return PyUnicode_FromFormat("Node(value=%lld, balance=%d)", node->value, (int)node->balance);
+}
+
+static PyObject *
+Node_get_value(NodeObject *self, void *Py_UNUSED(closure))
+{
+    return PyLong_FromLongLong(self->tree->nodes[self->index].value);
+}
+
+static PyObject *
+Node_get_balance(NodeObject *self, void *Py_UNUSED(closure))
+{
+    return PyLong_FromLong(self->tree->nodes[self->index].balance);
+}
+
+static PyObject *
+Node_get_left(NodeObject *self, void *Py_UNUSED(closure))
+{
+    return node_new_view(self->tree, self->tree->nodes[self->index].left);
+}
+
+static PyObject *
+Node_get_right(NodeObject *self, void *Py_UNUSED(closure))
+{
+    return node_new_view(self->tree, self->tree->nodes[self->index].right);
+}
+
+static PyGetSetDef Node_getset[] = {
+    {"value", (getter)Node_get_value, NULL, NULL, NULL},
+    {"balance", (getter)Node_get_balance, NULL, NULL, NULL},
+    {"left", (getter)Node_get_left, NULL, NULL, NULL},
+    {"right", (getter)Node_get_right, NULL, NULL, NULL},
+    {NULL},
+};
+
+static PyTypeObject NodeType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "scr._avltree.Node",
+    .tp_basicsize = sizeof(NodeObject),
+    .tp_dealloc = (destructor)Node_dealloc,
+    .tp_repr = (reprfunc)Node_repr,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_getset = Node_getset,
+};
+
+/* AVLTree type */
+
+static PyObject *
+AVLTree_new(PyTypeObject *type, PyObject *Py_UNUSED(args), PyObject *Py_UNUSED(kwargs))
+{
+    // The tree is valid and empty right after allocation, even if `__init__` is never called:
+    // the arena is allocated by `__init__` or by the first insertion
+    AVLTreeObject *self = (AVLTreeObject *)type->tp_alloc(type, 0);
+    if (self == NULL) {
+        return NULL;
+    }
+    self->nodes = NULL;
+    self->capacity = 0;
+    self->used = 0;
+    self->free_head = NIL;
+    self->root = NIL;
+    self->size = 0;
+    return (PyObject *)self;
+}
+
+static int
+AVLTree_init(AVLTreeObject *self, PyObject *args, PyObject *kwargs)
+{
+    static char *kwlist[] = {"capacity", NULL};
+    int capacity = DEFAULT_CAPACITY;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "|i", kwlist, &capacity)) {
+        return -1;
+    }
+    if (self->nodes != NULL) {
+        // Node views may still refer to the existing arena, so it's never replaced
+        PyErr_SetString(PyExc_RuntimeError, "AVLTree is already initialized");
+        return -1;
+    }
+    if (capacity < 1) {
+        PyErr_SetString(PyExc_ValueError, "capacity must be positive");
+        return -1;
+    }
+
+    self->nodes = PyMem_Malloc((size_t)capacity * sizeof(node_t));
+    if (self->nodes == NULL) {
+        PyErr_NoMemory();
+        return -1;
+    }
+    self->capacity = capacity;
+    return 0;
+}
+
+static void
+AVLTree_dealloc(AVLTreeObject *self)
+{
+    PyMem_Free(self->nodes);
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+static PyObject *
+AVLTree_find(AVLTreeObject *self, PyObject *arg)
+{
+    long long key = PyLong_AsLongLong(arg);
+    if (key == -1 && PyErr_Occurred()) {
+        return NULL;
+    }
+    return node_new_view(self, search(self, key));
+}
+
+static PyObject *
+AVLTree_insert(AVLTreeObject *self, PyObject *arg)
+{
+    long long key = PyLong_AsLongLong(arg);
+    if (key == -1 && PyErr_Occurred()) {
+        return NULL;
+    }
+
+    int result = tree_insert(self, key);
+    if (result < 0) {
+        return NULL;
+    }
+    return PyBool_FromLong(result);
+}
+
+static PyObject *
+AVLTree_remove(AVLTreeObject *self, PyObject *arg)
+{
+    long long key = PyLong_AsLongLong(arg);
+    if (key == -1 && PyErr_Occurred()) {
+        return NULL;
+    }
+    return PyBool_FromLong(tree_remove(self, key));
+}
+
+static PyObject *
+AVLTree_get_size(AVLTreeObject *self, void *Py_UNUSED(closure))
+{
+    return PyLong_FromSsize_t(self->size);
+}
+
+static PyObject *
+AVLTree_get_root(AVLTreeObject *self, void *Py_UNUSED(closure))
+{
+    return node_new_view(self, self->root);
+}
+
+static PyMethodDef AVLTree_methods[] = {
+    {"find", (PyCFunction)AVLTree_find, METH_O, NULL},
+    {"insert", (PyCFunction)AVLTree_insert, METH_O, NULL},
+    {"remove", (PyCFunction)AVLTree_remove, METH_O, NULL},
+    {NULL},
+};
+
+static PyGetSetDef AVLTree_getset[] = {
+    {"size", (getter)AVLTree_get_size, NULL, NULL, NULL},
+    {"root", (getter)AVLTree_get_root, NULL, NULL, NULL},
+    {NULL},
+};
+
+static PyTypeObject AVLTreeType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "scr._avltree.AVLTree",
+    .tp_basicsize = sizeof(AVLTreeObject),
+    .tp_dealloc = (destructor)AVLTree_dealloc,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_methods = AVLTree_methods,
+    .tp_getset = AVLTree_getset,
+    .tp_init = (initproc)AVLTree_init,
+    .tp_new = AVLTree_new,
+};
+
+/* Module */
+
+static struct PyModuleDef avltree_module = {
+    PyModuleDef_HEAD_INIT,
+    .m_name = "scr._avltree",
+    .m_size = -1,
+};
+
+PyMODINIT_FUNC
+PyInit__avltree(void)
+{
+    if (PyType_Ready(&NodeType) < 0 || PyType_Ready(&AVLTreeType) < 0) {
+        return NULL;
+    }
+
+    PyObject *module = PyModule_Create(&avltree_module);
+    if (module == NULL) {
+        return NULL;
+    }
+
+    if (PyModule_AddObjectRef(module, "Node", (PyObject *)&NodeType) < 0
+        || PyModule_AddObjectRef(module, "AVLTree", (PyObject *)&AVLTreeType) < 0) {
+        Py_DECREF(module);
+        return NULL;
+    }
+    return module;
+}
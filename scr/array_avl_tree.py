@@ -0,0 +1,349 @@
+import operator
+from collections.abc import Iterable
+
+import numpy as np
+
+# Index used instead of `None` for a missing child
+NIL = -1
+# Range of the keys, they're stored as int64
+INT64_MIN, INT64_MAX = -(2**63), 2**63 - 1
+
+
+def int64_key(value: int) -> int:
+    # Keys are stored as int64, so every key is checked before it touches the tree.
+    # `operator.index` rejects floats instead of truncating them, and ints that don't fit into 64 bits
+    # raise `OverflowError` instead of wrapping around. A plain int is returned, because the Numba
+    # dispatcher handles it faster than a NumPy scalar.
+    key = operator.index(value)
+    if not INT64_MIN <= key <= INT64_MAX:
+        raise OverflowError(f"{key} doesn't fit into int64")
+    return key
+
+
+def sorted_unique_keys(values: Iterable[int]) -> np.ndarray:
+    # Keys are checked the same way as in `int64_key`. NumPy arrays are checked and converted at once,
+    # `np.fromiter` would walk them element by element in Python.
+    if isinstance(values, np.ndarray):
+        if not np.issubdtype(values.dtype, np.integer):
+            raise TypeError(f"keys must be integers, not {values.dtype}")
+        if values.dtype.kind == "u" and values.size and values.max() > INT64_MAX:
+            raise OverflowError("the keys don't fit into int64")
+        keys = values.astype(np.int64)
+    else:
+        # NumPy converts a list of ints that fit into int64 to a signed int array at once.
+        # For anything else (floats, bigger ints, nested lists, an empty list) every key goes through `int64_key`.
+        values = list(values)
+        keys = np.array(values)
+        if keys.dtype.kind != "i" or keys.ndim != 1:
+            keys = np.fromiter(map(int64_key, values), dtype=np.int64, count=len(values))
+
+    # The stable sort is a timsort for int64, so already sorted keys are sorted in O(N).
+    # Duplicates are skipped the same way `insert` ignores them.
+    keys.sort(kind="stable")
+    is_unique = np.ones(len(keys), dtype=np.bool_)
+    np.not_equal(keys[1:], keys[:-1], out=is_unique[1:])
+    return keys[is_unique]
+
+
+def link_balanced(left: np.ndarray, right: np.ndarray, balance: np.ndarray, count: int) -> int:
+    # Links slots `0..count-1` into a perfectly balanced tree and returns its root.
+    # The slot of every node is its position in sorted order, so neighbouring keys sit next to each other
+    # in memory. The middle slot of every range is the root of its subtree, and all subtrees of one level
+    # are linked at once with array operations.
+    if count == 0:
+        return NIL
+
+    starts = np.zeros(1, dtype=np.int64)
+    stops = np.full(1, count, dtype=np.int64)
+    while starts.size:
+        middles = (starts + stops) // 2
+        left_sizes = middles - starts
+        right_sizes = stops - middles - 1
+
+        # A subtree of `n` nodes built this way has height `n.bit_length() - 1`,
+        # `frexp` returns exactly the bit length as the exponent
+        balance[middles] = np.frexp(right_sizes)[1] - np.frexp(left_sizes)[1]
+
+        has_left = left_sizes > 0
+        has_right = right_sizes > 0
+        left[middles[has_left]] = ((starts + middles) // 2)[has_left]
+        right[middles[has_right]] = ((middles + 1 + stops) // 2)[has_right]
+
+        starts, stops = (
+            np.concatenate((starts[has_left], middles[has_right] + 1)),
+            np.concatenate((middles[has_left], stops[has_right])),
+        )
+
+    return count // 2
+
+
+# The same AVL tree as `AVLTree`, but nodes are stored as parallel NumPy arrays (structure of arrays)
+# and refer to each other by array index instead of object reference.
+# Like `Node`, there's no parent link, so a node takes 8 bytes of value, two 4 byte links and 1 byte of balance.
+# This class is mainly the storage layout for `NumbaAVLTree`, which runs the same operations compiled.
+# Used from pure Python it's several times slower than `AVLTree`: every NumPy scalar indexing costs
+# more than following an attribute of a `Node`.
+# Docs link:
+# https://numpy.org/doc/stable/user/basics.indexing.html
+class ArrayAVLTree:
+    def __init__(self, capacity: int = 16) -> None:
+        # The arrays grow by doubling, so they must not start empty
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+
+        self.values = np.empty(capacity, dtype=np.int64)
+        self.left = np.full(capacity, NIL, dtype=np.int32)
+        self.right = np.full(capacity, NIL, dtype=np.int32)
+        # Balance factor is `right subtree height - left subtree height`, it's always in range [-2, 2]
+        self.balance = np.zeros(capacity, dtype=np.int8)
+
+        self.root = NIL
+        self.__size = 0
+        # Number of array slots handed out so far, slots of removed nodes are reused via `__free`
+        self.__used = 0
+        self.__free: list[int] = []
+
+    @classmethod
+    def from_sorted(cls, values: Iterable[int]) -> "ArrayAVLTree":
+        # The nodes are placed in sorted order and linked by `link_balanced`
+        keys = sorted_unique_keys(values)
+        count = len(keys)
+
+        tree = cls(capacity=max(count, 16))
+        tree.values[:count] = keys
+        tree.root = link_balanced(tree.left, tree.right, tree.balance, count)
+        tree.__size = count
+        tree.__used = count
+        return tree
+
+    @property
+    def size(self):
+        return self.__size
+
+    @property
+    def capacity(self) -> int:
+        return len(self.values)
+
+    def find(self, value: int) -> int | None:
+        # Returns the index of the node, it stays valid until the node is removed
+        value = int64_key(value)
+        values, left, right = self.values, self.left, self.right
+        current = self.root
+
+        while current != NIL:
+            current_value = values[current]
+            if value == current_value:
+                return current
+            current = int(left[current] if value < current_value else right[current])
+
+        return None
+
+    def insert(self, value: int) -> bool:
+        # The same single descent as in `AVLTree.insert`.
+        # The key is converted first, so an invalid one can't leave a half allocated node behind.
+        value = int64_key(value)
+        values, left, right, balance = self.values, self.left, self.right, self.balance
+        parent = NIL
+        current = self.root
+        top, top_parent = current, NIL
+
+        while current != NIL:
+            current_value = values[current]
+            if value == current_value:
+                return False
+            if balance[current] != 0:
+                top, top_parent = current, parent
+            parent = current
+            current = int(left[current] if value < current_value else right[current])
+
+        node = self.__allocate_node(value)
+
+        if parent == NIL:
+            self.root = node
+            return True
+
+        # The arrays may be replaced while growing, so they are read again
+        values, left, right, balance = self.values, self.left, self.right, self.balance
+        if value < values[parent]:
+            left[parent] = node
+        else:
+            right[parent] = node
+
+        # Update balances on the path from the top node down to the new one
+        is_left = value < values[top]
+        top_balance = int(balance[top]) + (-1 if is_left else 1)
+        balance[top] = top_balance
+        current = int(left[top] if is_left else right[top])
+        while current != node:
+            if value < values[current]:
+                balance[current] = -1
+                current = int(left[current])
+            else:
+                balance[current] = 1
+                current = int(right[current])
+
+        if top_balance == -2 or top_balance == 2:
+            self.__replace_child(top_parent, top, self.__rebalance(top))
+
+        return True
+
+    def remove(self, value: int) -> bool:
+        node_to_remove, path = self.__search_path_by_key(int64_key(value))
+
+        if node_to_remove == NIL:
+            return False
+
+        self.__bst_remove(node_to_remove, path)
+        self.__balance_after_remove(path)
+        return True
+
+    def __search_path_by_key(self, key: int) -> tuple[int, list[tuple[int, bool]]]:
+        # Returns the found node (or NIL) and the path to it, see `AVLTree.__search_path_by_key`
+        values, left, right = self.values, self.left, self.right
+        path = []
+        current = self.root
+
+        while current != NIL:
+            value = values[current]
+            if key == value:
+                break
+            is_left = bool(key < value)
+            path.append((current, is_left))
+            current = int(left[current] if is_left else right[current])
+
+        return current, path
+
+    def __grow(self) -> None:
+        extra = self.capacity
+
+        self.values = np.concatenate((self.values, np.empty(extra, dtype=np.int64)))
+        self.left = np.concatenate((self.left, np.full(extra, NIL, dtype=np.int32)))
+        self.right = np.concatenate((self.right, np.full(extra, NIL, dtype=np.int32)))
+        self.balance = np.concatenate((self.balance, np.zeros(extra, dtype=np.int8)))
+
+    # The slot of a new node is found before the insertion and taken only after it succeeded,
+    # so `NumbaAVLTree` can hand the slot to the compiled insertion and take it only if the key was new
+    def _next_slot(self) -> int:
+        # Returns the slot the next node goes to, growing the arrays if there's no free one
+        if self.__free:
+            return self.__free[-1]
+        if self.__used == self.capacity:
+            self.__grow()
+        return self.__used
+
+    def _take_slot(self) -> None:
+        # Takes the slot returned by `_next_slot`
+        if self.__free:
+            self.__free.pop()
+        else:
+            self.__used += 1
+        self.__size += 1
+
+    def _release_slot(self, node: int) -> None:
+        self.__free.append(node)
+        self.__size -= 1
+
+    def __allocate_node(self, key: int) -> int:
+        node = self._next_slot()
+        if node < self.__used:
+            # A reused slot still holds the links of the removed node, so they are reset.
+            # A never used slot already has empty links, the arrays are filled with them on creation.
+            self.left[node] = NIL
+            self.right[node] = NIL
+            self.balance[node] = 0
+
+        self.values[node] = key
+        self._take_slot()
+        return node
+
+    def __replace_child(self, parent: int, old_child: int, new_child: int) -> None:
+        if parent == NIL:
+            self.root = new_child
+        elif self.left[parent] == old_child:
+            self.left[parent] = new_child
+        else:
+            self.right[parent] = new_child
+
+    # Rotations are written out right here like in `AVLTree.__rebalance`.
+    # The new root of the subtree is returned, the caller links it to the parent.
+    def __rebalance(self, node: int) -> int:
+        # Fixes the node with balance factor -2 or 2 and returns the new root of its subtree
+        left, right, balance = self.left, self.right, self.balance
+
+        if balance[node] < 0:
+            child = int(left[node])
+            child_balance = balance[child]
+            if child_balance <= 0:
+                # Right rotation
+                left[node] = right[child]
+                right[child] = node
+                balance[node], balance[child] = (-1, 1) if child_balance == 0 else (0, 0)
+                return child
+
+            # Left-right rotation
+            grandchild = int(right[child])
+            grandchild_balance = balance[grandchild]
+            right[child] = left[grandchild]
+            left[node] = right[grandchild]
+            left[grandchild] = child
+            right[grandchild] = node
+            balance[child] = -1 if grandchild_balance > 0 else 0
+            balance[node] = 1 if grandchild_balance < 0 else 0
+            balance[grandchild] = 0
+            return grandchild
+
+        child = int(right[node])
+        child_balance = balance[child]
+        if child_balance >= 0:
+            # Left rotation
+            right[node] = left[child]
+            left[child] = node
+            balance[node], balance[child] = (1, -1) if child_balance == 0 else (0, 0)
+            return child
+
+        # Right-left rotation
+        grandchild = int(left[child])
+        grandchild_balance = balance[grandchild]
+        left[child] = right[grandchild]
+        right[node] = left[grandchild]
+        right[grandchild] = child
+        left[grandchild] = node
+        balance[child] = 1 if grandchild_balance < 0 else 0
+        balance[node] = -1 if grandchild_balance > 0 else 0
+        balance[grandchild] = 0
+        return grandchild
+
+    def __balance_after_remove(self, path: list[tuple[int, bool]]) -> None:
+        balance = self.balance
+        # The subtree under the last node of the path became one level lower
+        while path:
+            node, is_left_shorter = path.pop()
+            node_balance = int(balance[node]) + (1 if is_left_shorter else -1)
+            balance[node] = node_balance
+
+            if node_balance == -1 or node_balance == 1:
+                break
+            if node_balance != 0:
+                subtree = self.__rebalance(node)
+                self.__replace_child(path[-1][0] if path else NIL, node, subtree)
+                if balance[subtree] != 0:
+                    break
+
+    def __bst_remove(self, node: int, path: list[tuple[int, bool]]) -> None:
+        left, right = self.left, self.right
+
+        if left[node] != NIL and right[node] != NIL:
+            # Like in `AVLTree`, the successor's value is moved into the node and the successor is removed instead
+            path.append((node, False))
+            successor = int(right[node])
+            while left[successor] != NIL:
+                path.append((successor, True))
+                successor = int(left[successor])
+
+            self.values[node] = self.values[successor]
+            node = successor
+
+        # Now the node has at most one child which takes its place
+        child = int(left[node] if right[node] == NIL else right[node])
+        self.__replace_child(path[-1][0] if path else NIL, node, child)
+        self._release_slot(node)
@@ -1,34 +1,31 @@
-from dataclasses import dataclass, field
+from collections.abc import Iterable
 from typing import cast
 
 
-#  The `order=True` and `compare=True/False` make the `Node` class to be comparable only by value
-# Docs links:
-# https://docs.python.org/3/library/dataclasses.html?module-contents=#dataclasses.dataclass
-# https://docs.python.org/3/library/dataclasses.html?module-contents=#dataclasses.field
-@dataclass(order=True)
+# The `__slots__` removes the per-instance `__dict__`, so every node takes less memory
+# and attribute access is faster. Nodes aren't comparable, the tree compares their values directly.
+# Nodes don't keep a parent link, the tree walks down from the root and remembers the path when it needs it.
+# Docs link:
+# https://docs.python.org/3/reference/datamodel.html#slots
 class Node:
-    value: int = field(compare=True)
-    parent: "Node | None" = field(default=None, compare=False)
-    left: "Node | None" = field(default=None, compare=False)
-    right: "Node | None" = field(default=None, compare=False)
-    height: int = field(default=0, compare=False)
-
-    @property
-    def balance_factor(self) -> int:
-        right_child_height = -1 if self.right is None else self.right.height
-        left_child_height = -1 if self.left is None else self.left.height
-        return right_child_height - left_child_height
-
-
-@dataclass
-class NodeSearchResult:
-    searched_node: Node | None = None
-    insert_place: Node | None = None
-
-    @property
-    def is_found(self) -> bool:
-        return isinstance(self.searched_node, Node)
+    __slots__ = ("value", "left", "right", "balance")
+
+    def __init__(
+        self,
+        value: int,
+        left: "Node | None" = None,
+        right: "Node | None" = None,
+        balance: int = 0,
+    ) -> None:
+        self.value = value
+        self.left = left
+        self.right = right
+        # The balance factor is `right subtree height - left subtree height`.
+        # It's stored instead of the height, so it doesn't have to be recomputed from children
+        self.balance = balance
+
+    def __repr__(self) -> str:
+        return f"Node(value={self.value!r}, balance={self.balance!r})"
 
 
 class AVLTree:
@@ -36,236 +33,213 @@ class AVLTree:
         self.root = root
         self.__size = 0 if root is None else 1
 
+    @classmethod
+    def from_sorted(cls, values: Iterable[int]) -> "AVLTree":
+        # Builds a perfectly balanced tree in O(N) without any rotations: the middle key of every range
+        # becomes the root of its subtree. Sorting already sorted values is O(N), other values are sorted
+        # first and duplicates are skipped, like `insert` does.
+        keys = sorted(values)
+        keys = [key for index, key in enumerate(keys) if index == 0 or key != keys[index - 1]]
+
+        def build(start: int, stop: int) -> Node | None:
+            if start >= stop:
+                return None
+            middle = (start + stop) // 2
+            # A subtree of `n` nodes built this way has height `n.bit_length() - 1`
+            balance = (stop - middle - 1).bit_length() - (middle - start).bit_length()
+            return Node(keys[middle], build(start, middle), build(middle + 1, stop), balance)
+
+        tree = cls(build(0, len(keys)))
+        tree.__size = len(keys)
+        return tree
+
     @property
     def size(self):
         return self.__size
 
     def find(self, value: int) -> Node | None:
-        node = self.__create_node_from_value(value=value)
-        search_result = self.__search_node(node)
-
-        result = search_result.searched_node if search_result.is_found else None
-        return result
-
-    def insert(self, value: int | Node) -> bool:
-        new_node = self.__create_node_from_value(value)
-        is_inserted = self.__bst_insert(new_node)
-
-        if not is_inserted:
-            return False
-
-        self.__balance(new_node)
-        return True
-
-    def remove(self, value: int | Node) -> bool:
-        node = self.__create_node_from_value(value=value)
-        deleted_node = self.__bst_remove(node)
-
-        if deleted_node is None:
-            return False
-
-        if deleted_node.parent is not None:
-            self.__balance(deleted_node.parent)
-
-        return True
-
-    def __search_node(self, searched_node: Node) -> NodeSearchResult:
+        # The search loop is right here, so a lookup costs a single Python call
         current = self.root
-        result = NodeSearchResult()
 
         while current is not None:
-            if current == searched_node:
-                result.searched_node = current
-                break
-            next_node = current.left if searched_node < current else current.right
-            if next_node is None:
-                result.insert_place = current
-            current = next_node
-
-        return result
-
-    def __bst_insert(self, node: Node) -> bool:
-        search_result = self.__search_node(node)
-
-        if search_result.is_found:
-            return False
+            current_value = current.value
+            if value == current_value:
+                return current
+            current = current.left if value < current_value else current.right
+
+        return None
+
+    def insert(self, value: int) -> bool:
+        # Single descent from the root. On the way down it remembers the deepest node with non-zero balance
+        # (and its parent), because only the subtree of this node can get out of balance after insertion.
+        # All nodes below it have zero balance, so they only lean towards the new node.
+        parent = None
+        current = self.root
+        top, top_parent = current, None
 
-        parent = search_result.insert_place
+        while current is not None:
+            current_value = current.value
+            if value == current_value:
+                return False
+            if current.balance != 0:
+                top, top_parent = current, parent
+            parent = current
+            current = current.left if value < current_value else current.right
+
+        # The node is created only when it's known that the key isn't in the tree yet
+        node = Node(value)
+        self.__size += 1
 
         if parent is None:
             self.root = node
-        else:
-            node.parent = parent
-            if node < parent:
-                parent.left = node
-            else:
-                parent.right = node
+            return True
 
-        self.__size += 1
-        return True
-
-    def __update_height(self, node: Node) -> None:
-        left_height = node.left.height if node.left is not None else -1
-        right_height = node.right.height if node.right is not None else -1
-        
-        node.height = max(left_height, right_height) + 1
-
-    def __rotate_right(self, node: Node) -> None:
-        left_child = node.left
-
-        if left_child is None:
-            raise TypeError("node must have left child")
-
-        right_grandchild = left_child.right
-
-        # Perform rotation
-        left_child.right = node
-        node.left = right_grandchild
-
-        # Update parents
-        left_child.parent = node.parent
-        node.parent = left_child
-        if right_grandchild is not None:
-            right_grandchild.parent = node
-
-        if left_child.parent is None:
-            self.root = left_child
-        elif left_child.parent.left is node:
-            left_child.parent.left = left_child
+        if value < parent.value:
+            parent.left = node
         else:
-            left_child.parent.right = left_child
-
-        self.__update_height(node)
-        self.__update_height(left_child)
-
-    def __rotate_left(self, node: Node) -> None:
-        right_child = node.right
+            parent.right = node
+
+        # Update balances on the path from the top node down to the new one.
+        # Only the top node's balance needs to be read, every node below it had zero balance,
+        # so it's just overwritten with the side the path goes to.
+        top = cast("Node", top)
+        is_left = value < top.value
+        top.balance += -1 if is_left else 1
+        current = cast("Node", top.left if is_left else top.right)
+        while current is not node:
+            if value < current.value:
+                current.balance = -1
+                current = cast("Node", current.left)
+            else:
+                current.balance = 1
+                current = cast("Node", current.right)
 
-        if right_child is None:
-            raise TypeError("node must have right child")
+        if top.balance == -2 or top.balance == 2:
+            # After insertion a rotation restores the subtree height it had before, so nothing above changes
+            self.__replace_child(top_parent, top, self.__rebalance(top))
 
-        left_grandchild = right_child.left
+        return True
 
-        # Perform rotation
-        right_child.left = node
-        node.right = left_grandchild
+    def remove(self, value: int) -> bool:
+        node_to_remove, path = self.__search_path_by_key(value)
 
-        # Update parents
-        right_child.parent = node.parent
-        node.parent = right_child
-        if left_grandchild is not None:
-            left_grandchild.parent = node
+        if node_to_remove is None:
+            return False
 
-        # Update parent link
-        if right_child.parent is None:
-            self.root = right_child
-        elif right_child.parent.left is node:
-            right_child.parent.left = right_child
-        else:
-            right_child.parent.right = right_child
+        self.__bst_remove(node_to_remove, path)
+        self.__balance_after_remove(path)
+        return True
 
-        self.__update_height(node)
-        self.__update_height(right_child)
+    def __search_path_by_key(self, key: int) -> tuple[Node | None, list[tuple[Node, bool]]]:
+        # Returns the found node (or None) and the path to it.
+        # The path holds every ancestor and whether the search went to its left child.
+        path = []
+        current = self.root
 
-    def __balance(self, node: Node) -> None:
-        current = node
         while current is not None:
-            self.__update_height(current)
-            bf = current.balance_factor
-            if bf < -1:
-                if current.left is not None and current.left.balance_factor > 0:
-                    self.__rotate_left(current.left)
-                self.__rotate_right(current)
-            elif bf > 1:
-                if current.right is not None and current.right.balance_factor < 0:
-                    self.__rotate_right(current.right)
-                self.__rotate_left(current)
-
-            current = current.parent
-
-    def __bst_remove_leaf(self, node: Node) -> Node | None:
-        if not (node.left is None and node.right is None):
-            return None
-
-        if node.parent is None:
-            self.root = None
-        elif node is node.parent.left:
-            node.parent.left = None
-        else:
-            node.parent.right = None
-
-        self.__size -= 1
-        return node
-
-    def __bst_remove_one_child_node(self, node: Node) -> Node | None:
-        if (node.left is None) == (node.right is None):
-            return None
-
-        child = cast("Node", node.left if node.right is None else node.right)
-        if node.parent is None:
-            self.root = child
-            child.parent = None
-        elif node.parent.left is node:
-            node.parent.left = child
-            child.parent = node.parent
-        else:
-            node.parent.right = child
-            child.parent = node.parent
-
-        self.__size -= 1
-        return node
-
-    def __bst_remove_two_child_node(self, node: Node) -> Node | None:
-        if node.left is None or node.right is None:
-            return None
-
-        successor = node.right
-        while successor.left is not None:
-            successor = successor.left
-
-        node.value = successor.value
-        # The node wasn't actually deleted, its value was only replaced with successor's one
-        # So now we need to deleted successor.
-        # The successor now can only be a leaf or one-chid node so we use methods for this.
-        for case in (self.__bst_remove_one_child_node, self.__bst_remove_leaf):
-            deleted_node = case(successor)
-            if isinstance(deleted_node, Node):
+            value = current.value
+            if key == value:
                 break
+            is_left = key < value
+            path.append((current, is_left))
+            current = current.left if is_left else current.right
 
-        # According to the fact that successor is either leaf or one-chide node we can be certain
-        # that it will be deleted.
-        # As we need to make rebalance starting from actually deleted node parent, we return the successor
-        # instead of node
-        return successor
-
-    def __bst_remove(self, node: Node) -> Node | None:
-        search_result = self.__search_node(node)
-        node_to_remove = search_result.searched_node
-        if not node_to_remove:
-            return None
-
-        # Here's three possible removal scenarios in BST. And If the runtime reach this point it granites that
-        # one of this methods return deleted node because the node_to_delete is already in this tree.
-        cases = [
-            self.__bst_remove_leaf,
-            self.__bst_remove_one_child_node,
-            self.__bst_remove_two_child_node,
-        ]
-        for case in cases:
-            deleted_node = case(node_to_remove)
-            if isinstance(deleted_node, Node):
-                break
-        else:
-            # One of the cases must return a Node type. if it's not there's an error in logic
-            raise RuntimeError("The loop with removal scenarios must hit break")
+        return current, path
 
-        return deleted_node
+    def __replace_child(self, parent: Node | None, old_child: Node, new_child: Node | None) -> None:
+        if parent is None:
+            self.root = new_child
+        elif parent.left is old_child:
+            parent.left = new_child
+        else:
+            parent.right = new_child
 
+    # Rotations are written out right here instead of separate rotation methods, so rebalancing
+    # costs a single Python call. The new root of the subtree is returned, the caller links it to the parent.
+    # The balance factors after a rotation depend only on the balance of the child (single rotation)
+    # or grandchild (double rotation) which becomes the new subtree root.
     @staticmethod
-    def __create_node_from_value(value: int | Node) -> Node:
-        if not isinstance(value, (int, Node)):
-            message = f"value parameter must be type int or Node but you provide type {type(value)}"
-            raise TypeError(message)
-        if isinstance(value, Node):
-            return value
-        return Node(value)
+    def __rebalance(node: Node) -> Node:
+        # Fixes the node with balance factor -2 or 2 and returns the new root of its subtree
+        if node.balance < 0:
+            child = cast("Node", node.left)
+            if child.balance <= 0:
+                # Right rotation
+                node.left = child.right
+                child.right = node
+                if child.balance == 0:
+                    node.balance, child.balance = -1, 1
+                else:
+                    node.balance, child.balance = 0, 0
+                return child
+
+            # Left-right rotation
+            grandchild = cast("Node", child.right)
+            child.right = grandchild.left
+            node.left = grandchild.right
+            grandchild.left = child
+            grandchild.right = node
+            child.balance = -1 if grandchild.balance > 0 else 0
+            node.balance = 1 if grandchild.balance < 0 else 0
+            grandchild.balance = 0
+            return grandchild
+
+        child = cast("Node", node.right)
+        if child.balance >= 0:
+            # Left rotation
+            node.right = child.left
+            child.left = node
+            if child.balance == 0:
+                node.balance, child.balance = 1, -1
+            else:
+                node.balance, child.balance = 0, 0
+            return child
+
+        # Right-left rotation
+        grandchild = cast("Node", child.left)
+        child.left = grandchild.right
+        node.right = grandchild.left
+        grandchild.right = child
+        grandchild.left = node
+        child.balance = 1 if grandchild.balance < 0 else 0
+        node.balance = -1 if grandchild.balance > 0 else 0
+        grandchild.balance = 0
+        return grandchild
+
+    def __balance_after_remove(self, path: list[tuple[Node, bool]]) -> None:
+        # Unlike insertion, removal can rotate on every level, so the bound method is looked up only once
+        rebalance = self.__rebalance
+        # The subtree under the last node of the path became one level lower
+        while path:
+            node, is_left_shorter = path.pop()
+            balance = node.balance + (1 if is_left_shorter else -1)
+            node.balance = balance
+
+            if balance == -1 or balance == 1:
+                # The node was balanced before, so its height didn't change
+                break
+            if balance != 0:
+                subtree = rebalance(node)
+                self.__replace_child(path[-1][0] if path else None, node, subtree)
+                if subtree.balance != 0:
+                    # The sibling subtree was balanced, the rotation kept the subtree height
+                    break
+
+    def __bst_remove(self, node: Node, path: list[tuple[Node, bool]]) -> None:
+        if node.left is not None and node.right is not None:
+            # The node isn't actually deleted, its value is only replaced with successor's one.
+            # The successor has no left child, so it's unlinked the same way as a leaf or one-child node.
+            path.append((node, False))
+            successor = node.right
+            while successor.left is not None:
+                path.append((successor, True))
+                successor = successor.left
+
+            node.value = successor.value
+            node = successor
+
+        # Now the node has at most one child which takes its place
+        child = node.left if node.right is None else node.right
+        self.__replace_child(path[-1][0] if path else None, node, child)
+        self.__size -= 1
+
@@ -0,0 +1,242 @@
+import numpy as np
+from numba import njit
+
+from scr.array_avl_tree import NIL, ArrayAVLTree, int64_key
+
+# AVL tree height is below 1.45 * log2(n + 2), so a path of int32-indexed nodes never gets longer than this
+MAX_HEIGHT = 64
+
+
+# The hot loops work on the same arrays as `ArrayAVLTree`, so Numba compiles them to plain integer
+# array indexing without the interpreter overhead. Functions that can change the root return it,
+# because Numba can't assign to attributes of a regular Python object.
+# `cache=True` saves the compiled code next to the module, so only the very first run pays for compiling.
+# Docs link:
+# https://numba.readthedocs.io/en/stable/user/jit.html
+@njit(cache=True)
+def search(values, left, right, root, key):
+    current = root
+
+    while current != NIL:
+        value = values[current]
+        if key == value:
+            return current
+        current = left[current] if key < value else right[current]
+
+    return NIL
+
+
+@njit(cache=True)
+def replace_child(left, right, root, parent, old_child, new_child):
+    if parent == NIL:
+        return new_child
+    if left[parent] == old_child:
+        left[parent] = new_child
+    else:
+        right[parent] = new_child
+    return root
+
+
+# The rotations expect that the node has the child they rotate, the caller guarantees it.
+# They return the new root of the subtree, the caller links it to the parent.
+@njit(cache=True)
+def rotate_right(left, right, balance, node):
+    left_child = left[node]
+
+    # Perform rotation
+    left[node] = right[left_child]
+    right[left_child] = node
+
+    # Update balance factors of the two rotated nodes
+    node_balance = balance[node] + 1 - min(balance[left_child], 0)
+    balance[node] = node_balance
+    balance[left_child] = balance[left_child] + 1 + max(node_balance, 0)
+    return left_child
+
+
+@njit(cache=True)
+def rotate_left(left, right, balance, node):
+    right_child = right[node]
+
+    # Perform rotation
+    right[node] = left[right_child]
+    left[right_child] = node
+
+    # Update balance factors of the two rotated nodes
+    node_balance = balance[node] - 1 - max(balance[right_child], 0)
+    balance[node] = node_balance
+    balance[right_child] = balance[right_child] - 1 + min(node_balance, 0)
+    return right_child
+
+
+@njit(cache=True)
+def rebalance(left, right, balance, node):
+    # Fixes the node with balance factor -2 or 2 and returns the new root of its subtree
+    if balance[node] < 0:
+        left_child = left[node]
+        if balance[left_child] > 0:
+            left[node] = rotate_left(left, right, balance, left_child)
+        return rotate_right(left, right, balance, node)
+
+    right_child = right[node]
+    if balance[right_child] < 0:
+        right[node] = rotate_right(left, right, balance, right_child)
+    return rotate_left(left, right, balance, node)
+
+
+@njit(cache=True)
+def insert(values, left, right, balance, root, key, node):
+    # Puts `key` into the free slot `node`. Returns the root and whether the key was inserted.
+    # The same single descent as in `AVLTree.insert`
+    parent = NIL
+    current = root
+    top = root
+    top_parent = NIL
+
+    while current != NIL:
+        value = values[current]
+        if key == value:
+            return root, False
+        if balance[current] != 0:
+            top = current
+            top_parent = parent
+        parent = current
+        current = left[current] if key < value else right[current]
+
+    values[node] = key
+    left[node] = NIL
+    right[node] = NIL
+    balance[node] = 0
+
+    if parent == NIL:
+        return node, True
+
+    if key < values[parent]:
+        left[parent] = node
+    else:
+        right[parent] = node
+
+    # Update balances on the path from the top node down to the new one
+    current = top
+    while current != node:
+        if key < values[current]:
+            balance[current] -= 1
+            current = left[current]
+        else:
+            balance[current] += 1
+            current = right[current]
+
+    if balance[top] == -2 or balance[top] == 2:
+        root = replace_child(left, right, root, top_parent, top, rebalance(left, right, balance, top))
+
+    return root, True
+
+
+@njit(cache=True)
+def remove(values, left, right, balance, root, key, path_nodes, path_is_left):
+    # Returns the root and the freed slot (or NIL if the key isn't in the tree).
+    # `path_nodes` and `path_is_left` are scratch buffers for the path from the root to the removed node
+    depth = 0
+    node = root
+
+    while node != NIL:
+        value = values[node]
+        if key == value:
+            break
+        is_left = key < value
+        path_nodes[depth] = node
+        path_is_left[depth] = is_left
+        depth += 1
+        node = left[node] if is_left else right[node]
+
+    if node == NIL:
+        return root, NIL
+
+    if left[node] != NIL and right[node] != NIL:
+        # The successor's value is moved into the node and the successor is removed instead
+        path_nodes[depth] = node
+        path_is_left[depth] = False
+        depth += 1
+        successor = right[node]
+        while left[successor] != NIL:
+            path_nodes[depth] = successor
+            path_is_left[depth] = True
+            depth += 1
+            successor = left[successor]
+        values[node] = values[successor]
+        node = successor
+
+    # Now the node has at most one child which takes its place
+    child = left[node] if right[node] == NIL else right[node]
+    root = replace_child(left, right, root, path_nodes[depth - 1] if depth > 0 else NIL, node, child)
+
+    # The subtree under the last node of the path became one level lower
+    while depth > 0:
+        depth -= 1
+        current = path_nodes[depth]
+        current_balance = balance[current] + (1 if path_is_left[depth] else -1)
+        balance[current] = current_balance
+
+        if current_balance == -1 or current_balance == 1:
+            break
+        if current_balance != 0:
+            subtree = rebalance(left, right, balance, current)
+            root = replace_child(left, right, root, path_nodes[depth - 1] if depth > 0 else NIL, current, subtree)
+            if balance[subtree] != 0:
+                break
+
+    return root, node
+
+
+# Shares the arrays and the slot bookkeeping with `ArrayAVLTree`, only the operations
+# are delegated to the compiled functions above. Keys are converted with `int64_key` before they're
+# passed to the compiled functions, otherwise Numba types an int above the int64 range as uint64
+# and it wraps around when it's stored.
+class NumbaAVLTree(ArrayAVLTree):
+    def __init__(self, capacity: int = 16) -> None:
+        super().__init__(capacity)
+        # Scratch buffers for the removal path, so `remove` doesn't allocate them on every call
+        self.__path_nodes = np.empty(MAX_HEIGHT, dtype=np.int32)
+        self.__path_is_left = np.empty(MAX_HEIGHT, dtype=np.bool_)
+
+    @staticmethod
+    def warm_up() -> None:
+        # Compiles (or loads from cache) all functions, so the first real call isn't slowed down by it
+        tree = NumbaAVLTree(capacity=1)
+        tree.insert(0)
+        tree.find(0)
+        tree.remove(0)
+
+    def find(self, value: int) -> int | None:
+        searched_node = search(self.values, self.left, self.right, self.root, int64_key(value))
+        return None if searched_node == NIL else int(searched_node)
+
+    def insert(self, value: int) -> bool:
+        value = int64_key(value)
+        node = self._next_slot()
+        self.root, is_inserted = insert(self.values, self.left, self.right, self.balance, self.root, value, node)
+
+        if not is_inserted:
+            return False
+
+        # The slot is taken only after the key was inserted into it
+        self._take_slot()
+        return True
+
+    def remove(self, value: int) -> bool:
+        self.root, deleted_node = remove(
+            self.values,
+            self.left,
+            self.right,
+            self.balance,
+            self.root,
+            int64_key(value),
+            self.__path_nodes,
+            self.__path_is_left,
+        )
+
+        if deleted_node == NIL:
+            return False
+
+        self._release_slot(int(deleted_node))
+        return True
@@ -0,0 +1,16 @@
+# Builds the optional C implementation of the tree, the project metadata lives in `pyproject.toml`.
+# Build it in place so `scr._avltree` can be imported from the repository:
+#     python setup.py build_ext --inplace
+import sys
+
+from setuptools import Extension, setup
+
+extra_compile_args = ["/O2"] if sys.platform == "win32" else ["-O3"]
+
+setup(
+    packages=["scr"],
+    py_modules=[],
+    ext_modules=[
+        Extension("scr._avltree", sources=["scr/_avltree.c"], extra_compile_args=extra_compile_args),
+    ],
+)
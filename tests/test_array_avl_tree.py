@@ -0,0 +1,40 @@
+import unittest
+
+from tests.tree_checks import ArrayTreeChecks, FromSortedChecks, Int64KeyChecks
+
+try:
+    from scr.array_avl_tree import ArrayAVLTree
+except ImportError:
+    ArrayAVLTree = None
+
+
+@unittest.skipIf(ArrayAVLTree is None, "NumPy isn't installed")
+class ArrayAVLTreeTest(FromSortedChecks, Int64KeyChecks, ArrayTreeChecks, unittest.TestCase):
+    tree_class = ArrayAVLTree
+
+    def test_reused_slots(self):
+        # Removed nodes give their slots to the new ones, so the arrays don't grow
+        tree = self.tree_class(capacity=16)
+        for key in range(16):
+            tree.insert(key)
+        for key in range(0, 16, 2):
+            tree.remove(key)
+        for key in range(16, 24):
+            tree.insert(key)
+        self.assertEqual(tree.capacity, 16)
+        self.assert_valid(tree, {key for key in range(24) if key >= 16 or key % 2})
+
+    def test_capacity(self):
+        with self.assertRaises(ValueError):
+            self.tree_class(capacity=0)
+
+        # The arrays grow as needed beyond the initial capacity
+        tree = self.tree_class(capacity=1)
+        for key in range(100):
+            tree.insert(key)
+        self.assertGreaterEqual(tree.capacity, 100)
+        self.assert_valid(tree, set(range(100)))
+
+
+if __name__ == "__main__":
+    unittest.main()
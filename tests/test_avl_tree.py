@@ -0,0 +1,20 @@
+import unittest
+
+from scr.avl_tree import AVLTree
+from tests.tree_checks import FromSortedChecks, TreeChecks
+
+
+class AVLTreeTest(FromSortedChecks, TreeChecks, unittest.TestCase):
+    tree_class = AVLTree
+
+    def test_big_int_keys(self):
+        # Unlike the array and C trees, keys aren't limited to 64 bits
+        tree = self.tree_class()
+        tree.insert(1)
+        self.assertTrue(tree.insert(2**63))
+        self.assertIsNotNone(tree.find(2**63))
+        self.assert_valid(tree, {1, 2**63})
+
+
+if __name__ == "__main__":
+    unittest.main()
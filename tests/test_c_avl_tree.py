@@ -0,0 +1,38 @@
+import unittest
+
+from tests.tree_checks import Int64KeyChecks, TreeChecks
+
+try:
+    from scr._avltree import AVLTree as CAVLTree
+except ImportError:
+    CAVLTree = None
+
+
+@unittest.skipIf(CAVLTree is None, "the C extension isn't built")
+class CAVLTreeTest(Int64KeyChecks, TreeChecks, unittest.TestCase):
+    tree_class = CAVLTree
+
+    def test_new_without_init(self):
+        # A tree that skipped `__init__` is an empty tree, its arena is allocated by the first insertion
+        tree = self.tree_class.__new__(self.tree_class)
+        self.assertIsNone(tree.root)
+        self.assertIsNone(tree.find(1))
+        self.assertFalse(tree.remove(1))
+        for key in range(100):
+            self.assertTrue(tree.insert(key))
+        self.assert_valid(tree, set(range(100)))
+
+    def test_init_twice(self):
+        tree = self.tree_class(capacity=1)
+        tree.insert(1)
+        with self.assertRaises(RuntimeError):
+            tree.__init__()
+        self.assert_valid(tree, {1})
+
+    def test_invalid_capacity(self):
+        with self.assertRaises(ValueError):
+            self.tree_class(capacity=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+
+from tests.tree_checks import ArrayTreeChecks, FromSortedChecks, Int64KeyChecks
+
+try:
+    from scr.numba_avl_tree import NumbaAVLTree
+except ImportError:
+    NumbaAVLTree = None
+
+
+@unittest.skipIf(NumbaAVLTree is None, "Numba isn't installed")
+class NumbaAVLTreeTest(FromSortedChecks, Int64KeyChecks, ArrayTreeChecks, unittest.TestCase):
+    tree_class = NumbaAVLTree
+
+    def test_int64_keys_on_empty_tree(self):
+        # Numba would type such a key as uint64, so it must be rejected even when there's nothing to compare with
+        tree = self.tree_class()
+        for operation in (tree.insert, tree.find, tree.remove):
+            with self.assertRaises(OverflowError):
+                operation(2**63)
+        self.assert_valid(tree, set())
+
+    def test_capacity(self):
+        # The compiled functions don't check bounds, so empty arrays would be written past their end
+        with self.assertRaises(ValueError):
+            self.tree_class(capacity=0)
+
+        tree = self.tree_class(capacity=1)
+        for key in range(100):
+            tree.insert(key)
+        self.assertGreaterEqual(tree.capacity, 100)
+        self.assert_valid(tree, set(range(100)))
+
+
+if __name__ == "__main__":
+    unittest.main()
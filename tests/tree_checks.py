@@ -0,0 +1,142 @@
+import random
+
+# Index of a missing child in the array trees, the same as `scr.array_avl_tree.NIL`.
+# It's repeated here, so the checks can be imported without NumPy
+NIL = -1
+
+
+# Checks shared by the tests of every tree implementation. A test class mixes them into `unittest.TestCase`
+# and sets `tree_class`. `read_node` is overridden by trees that don't refer to nodes by objects.
+class TreeChecks:
+    tree_class = None
+
+    def read_node(self, tree, node):
+        # Returns `(value, balance, left, right)` of the node, or None for a missing child
+        if node is None:
+            return None
+        return node.value, node.balance, node.left, node.right
+
+    def assert_valid(self, tree, expected: set[int]) -> None:
+        # Checks the order of keys, the stored balance factors, the AVL invariant and the size
+        values = []
+
+        def height(node, low, high) -> int:
+            fields = self.read_node(tree, node)
+            if fields is None:
+                return 0
+            value, balance, left, right = fields
+            self.assertTrue(low is None or low < value, "keys are out of order")
+            self.assertTrue(high is None or value < high, "keys are out of order")
+
+            left_height = height(left, low, value)
+            values.append(value)
+            right_height = height(right, value, high)
+            self.assertEqual(balance, right_height - left_height, f"wrong balance of {value}")
+            self.assertIn(balance, (-1, 0, 1), f"{value} is out of balance")
+            return max(left_height, right_height) + 1
+
+        height(tree.root, None, None)
+        self.assertEqual(values, sorted(expected))
+        self.assertEqual(tree.size, len(expected))
+
+    def test_random_operations(self):
+        for seed in range(100):
+            rng = random.Random(seed)
+            tree = self.tree_class()
+            expected = set()
+            key_range = rng.choice((10, 50, 300))
+
+            for _ in range(rng.randint(1, 300)):
+                key = rng.randint(-key_range, key_range)
+                if rng.random() < 0.6:
+                    self.assertEqual(tree.insert(key), key not in expected)
+                    expected.add(key)
+                else:
+                    self.assertEqual(tree.remove(key), key in expected)
+                    expected.discard(key)
+                self.assertEqual(tree.find(key) is not None, key in expected)
+                self.assert_valid(tree, expected)
+
+    def test_sorted_insertion(self):
+        tree = self.tree_class()
+        for key in range(1000):
+            tree.insert(key)
+        for key in range(0, 1000, 3):
+            tree.remove(key)
+        self.assert_valid(tree, {key for key in range(1000) if key % 3})
+
+
+class ArrayTreeChecks(TreeChecks):
+    # The array trees refer to nodes by index
+    def read_node(self, tree, node):
+        if node == NIL:
+            return None
+        return int(tree.values[node]), int(tree.balance[node]), int(tree.left[node]), int(tree.right[node])
+
+
+# Checks for trees with `from_sorted`, mixed in along with `TreeChecks`
+class FromSortedChecks:
+    def test_from_sorted(self):
+        for count in range(70):
+            tree = self.tree_class.from_sorted(range(count))
+            self.assert_valid(tree, set(range(count)))
+
+        # Unsorted values with duplicates are accepted too
+        values = [5, 3, 9, 3, 1, 5, 7]
+        tree = self.tree_class.from_sorted(values)
+        self.assert_valid(tree, set(values))
+
+        # The built tree keeps working as a regular one
+        expected = set(values)
+        for key in range(12):
+            if key % 2:
+                self.assertEqual(tree.remove(key), key in expected)
+                expected.discard(key)
+            else:
+                self.assertEqual(tree.insert(key), key not in expected)
+                expected.add(key)
+        self.assert_valid(tree, expected)
+
+
+# Checks for trees that store keys as int64, mixed in along with `TreeChecks`
+class Int64KeyChecks:
+    def test_int64_keys(self):
+        tree = self.tree_class()
+        tree.insert(1)
+
+        # Every operation checks the key the same way, so a float equal to a stored key isn't found either
+        for operation in (tree.insert, tree.find, tree.remove):
+            for key in (2**63, -(2**63) - 1):
+                with self.assertRaises(OverflowError):
+                    operation(key)
+            for key in (2.5, 1.0):
+                with self.assertRaises(TypeError):
+                    operation(key)
+        # Nothing was changed by the rejected keys
+        self.assert_valid(tree, {1})
+        self.assertTrue(tree.insert(2))
+        self.assertTrue(tree.insert(2**63 - 1))
+        self.assertTrue(tree.insert(-(2**63)))
+        self.assert_valid(tree, {1, 2, 2**63 - 1, -(2**63)})
+
+    def test_int64_keys_from_sorted(self):
+        if not hasattr(self.tree_class, "from_sorted"):
+            self.skipTest("the tree has no from_sorted")
+
+        # `from_sorted` rejects the same keys as `insert`, also when they come as a NumPy array
+        import numpy as np
+
+        invalid_keys = [
+            (TypeError, [2.5, 2.7, 3]),
+            (TypeError, np.array([2.5, 2.7, 3])),
+            (OverflowError, [1, 2**63]),
+            (OverflowError, np.array([1, 2**63 + 5], dtype=np.uint64)),
+        ]
+        for error, values in invalid_keys:
+            with self.assertRaises(error):
+                self.tree_class.from_sorted(values)
+
+        tree = self.tree_class.from_sorted(np.array([3, 1, 2**63 - 1], dtype=np.uint64))
+        self.assert_valid(tree, {1, 3, 2**63 - 1})
+        tree = self.tree_class.from_sorted(np.array([3, -1, 3], dtype=np.int8))
+        self.assert_valid(tree, {-1, 3})